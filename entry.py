@@ -1,17 +1,26 @@
 # file: entry.py
 import argparse
+import http.client
 import json
 import string
 import re
+import secrets
 import sys
 import time
-import urllib.request
 import random
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 from playwright.sync_api import Playwright, sync_playwright
 
+try:
+    import orjson  # optional: faster JSON decoding
+except ImportError:
+    orjson = None
+
 CDP: Optional[str] = "http://127.0.0.1:9222"
 TARGET_URL: Optional[str] = None
 
@@ -23,7 +32,8 @@ END = "\033[0m"
 
 # -------- confirmation gates --------
 def _make_code(length: int, alphabet: str) -> str:
-    return "".join(random.choice(alphabet) for _ in range(int(length)))
+    # secrets, not random: the code must not be predictable from a seeded PRNG.
+    return "".join(secrets.choice(alphabet) for _ in range(int(length)))
 
 def require_typed_confirmation(
     *,
@@ -52,85 +62,173 @@ def require_typed_confirmation(
 
     return True
 
+# -------- json --------
+def load_json_file(path: Path) -> Any:
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
 # -------- templating --------
 VAR_RE = re.compile(r"\{\{\s*([a-zA-Z0-9_.-]+)\s*\}\}")
 
-def _get_by_path(data: Dict[str, Any], path: str) -> Any:
-    cur: Any = data
-    for part in path.split("."):
-        if isinstance(cur, dict) and part in cur:
-            cur = cur[part]
-        else:
+TEMPLATE_FIELDS = ("selector", "url", "value", "key", "count")
+# Names a step may reference; other Event fields are internal and render as "".
+TEMPLATE_VARS = frozenset(("issue", "subject", "date", "duration_minutes", "duration_str"))
+
+# Template opcodes: literal text, single-segment var, dotted-path var.
+_LIT, _FLAT, _DEEP = 0, 1, 2
+_MISSING = object()
+
+def _lookup(ev: "Event", path: Tuple[str, ...]) -> str:
+    cur: Any = getattr(ev, path[0], None)
+    for part in path[1:]:
+        if not isinstance(cur, dict):
             return ""
-    return cur
-
-def render_template(value: Optional[str], data: Optional[Dict[str, Any]]) -> str:
-    if not isinstance(value, str) or not data:
-        return value if isinstance(value, str) else ""
-    def repl(m: re.Match) -> str:
-        key = m.group(1)
-        v = _get_by_path(data, key)
-        return "" if v is None else str(v)
-    return VAR_RE.sub(repl, value)
-
-def render_steps(steps: List[Dict[str, Any]], vars_: Dict[str, Any]) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for s in steps:
-        r = dict(s)
-        if "selector" in r:
-            r["selector"] = render_template(r["selector"], vars_)
-        if "url" in r:
-            r["url"] = render_template(r["url"], vars_)
-        if "value" in r:
-            r["value"] = render_template(r["value"], vars_)
-        if "key" in r:
-            r["key"] = render_template(r["key"], vars_)
-        if "count" in r:
-            try:
-                r["count"] = int(render_template(str(r["count"]), vars_))
-            except Exception:
-                pass
-        out.append(r)
-    return out
+        cur = cur.get(part, _MISSING)
+        if cur is _MISSING:
+            return ""
+    return "" if cur is None else str(cur)
+
+def compile_template(value: str) -> Any:
+    # Plain strings (no {{...}}) are kept as-is and never rendered.
+    # Vars outside TEMPLATE_VARS can never resolve, so they compile to "".
+    tokens: List[Tuple[int, Any]] = []
+    pos = 0
+    for m in VAR_RE.finditer(value):
+        if m.start() > pos:
+            tokens.append((_LIT, value[pos:m.start()]))
+        path = tuple(m.group(1).split("."))
+        if path[0] not in TEMPLATE_VARS:
+            tokens.append((_LIT, ""))
+        elif len(path) == 1:
+            tokens.append((_FLAT, path[0]))
+        else:
+            tokens.append((_DEEP, path))
+        pos = m.end()
+    if not tokens:
+        return value
+    if pos < len(value):
+        tokens.append((_LIT, value[pos:]))
+    if all(op == _LIT for op, _ in tokens):
+        return "".join(val for _, val in tokens)
+    return _codegen(tokens)
+
+def _codegen(tokens: List[Tuple[int, Any]]) -> Any:
+    # Bake the token list into one straight-line function: ev -> str.
+    exprs: List[str] = []
+    for op, val in tokens:
+        if op == _LIT:
+            if val:
+                exprs.append(repr(val))
+        elif op == _FLAT:
+            # TEMPLATE_VARS are all str fields on Event, so no str() wrap is needed.
+            exprs.append(f"ev.{val}")
+        else:
+            exprs.append(f"_lookup(ev, {val!r})")
+    ns: Dict[str, Any] = {"_lookup": _lookup}
+    exec(f"def _r(ev):\n    return {' + '.join(exprs)}\n", ns)
+    return ns["_r"]
+
+def render_compiled(compiled: Any, ev: "Event") -> str:
+    return compiled if type(compiled) is str else compiled(ev)
+
+def compile_fields(step: Dict[str, Any]) -> Dict[str, Any]:
+    compiled: Dict[str, Any] = {}
+    for field in TEMPLATE_FIELDS:
+        if field not in step:
+            continue
+        raw = step[field]
+        if field == "count":
+            compiled[field] = _compile_count(raw)
+        else:
+            compiled[field] = compile_template(raw) if isinstance(raw, str) else ""
+    return compiled
+
+def _compile_count(raw: Any) -> Any:
+    # A count with no live vars is converted to int once, here.
+    compiled = compile_template(str(raw))
+    if type(compiled) is str:
+        try:
+            return int(compiled) or 1
+        except ValueError:
+            pass
+    return compiled
+
+def compile_plan(steps: List[Dict[str, Any]]) -> List[Tuple[Any, Dict[str, Any], Dict[str, Any]]]:
+    return [(s.get("action"), s, compile_fields(s)) for s in steps]
+
+def render_count(cf: Dict[str, Any], step: Dict[str, Any], ev: "Event") -> int:
+    compiled = cf.get("count")
+    if type(compiled) is int:
+        return compiled
+    count = step.get("count", 1)
+    if compiled is not None:
+        try:
+            count = int(render_compiled(compiled, ev))
+        except Exception:
+            pass
+    return int(count or 1)
 
 # -------- CDP helpers --------
+# Last DevTools target that answered; reused by later replays in this process.
+_CACHED_TARGET: Optional[Tuple[Optional[int], str]] = None
+
+def _probe_ws(scheme: str, host: str, port: int, base_path: str = "") -> Optional[str]:
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(host, port, timeout=1.5)
+    try:
+        conn.request("GET", f"{base_path}/json/version")
+        resp = conn.getresponse()
+        data = json.loads(resp.read().decode())
+        return data.get("webSocketDebuggerUrl")
+    finally:
+        conn.close()
+
 def find_cdp_endpoint() -> Tuple[int, str]:
     for port in (9222, 9223, 9224, 9225):
         try:
-            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1.5) as r:
-                data = json.loads(r.read().decode())
-                ws = data.get("webSocketDebuggerUrl")
-                if ws:
-                    return port, ws
+            ws = _probe_ws("http", "127.0.0.1", port)
+            if ws:
+                return port, ws
         except Exception:
             continue
     raise RuntimeError("No Chrome DevTools endpoint found on ports 9222–9225")
 
 def resolve_cdp_target() -> Tuple[Optional[int], str]:
+    global _CACHED_TARGET
+    if _CACHED_TARGET:
+        return _CACHED_TARGET
     if CDP:
         if CDP.startswith(("ws://", "wss://")):
             return None, CDP
         if CDP.startswith(("http://", "https://")):
+            # Explicit host:port: probe it directly and only scan if it does not answer.
             try:
-                with urllib.request.urlopen(f"{CDP.rstrip('/')}/json/version", timeout=1.5) as r:
-                    data = json.loads(r.read().decode())
-                    ws = data.get("webSocketDebuggerUrl")
-                    if not ws:
-                        raise RuntimeError("DevTools responded without webSocketDebuggerUrl")
-                    try:
-                        port = int(CDP.split(":")[-1].split("/")[0])
-                    except Exception:
-                        port = None
-                    return port, ws
+                u = urlsplit(CDP)
+                port = u.port or (443 if u.scheme == "https" else 80)
+                ws = _probe_ws(u.scheme, u.hostname or "127.0.0.1", port, u.path.rstrip("/"))
+                if not ws:
+                    raise RuntimeError("DevTools responded without webSocketDebuggerUrl")
+                _CACHED_TARGET = (u.port, ws)
+                return _CACHED_TARGET
             except Exception:
                 pass
-    port, ws = find_cdp_endpoint()
-    return port, ws
+    _CACHED_TARGET = find_cdp_endpoint()
+    return _CACHED_TARGET
 
 # -------- browser wiring --------
 def connect_browser_for_replay(p: Playwright):
+    global _CACHED_TARGET
+    cached = _CACHED_TARGET is not None
     port, ws = resolve_cdp_target()
-    browser = p.chromium.connect_over_cdp(ws)
+    try:
+        browser = p.chromium.connect_over_cdp(ws)
+    except Exception:
+        if not cached:
+            raise
+        # Chrome may have restarted since the target was cached.
+        _CACHED_TARGET = None
+        port, ws = resolve_cdp_target()
+        browser = p.chromium.connect_over_cdp(ws)
     if port:
         print(f"[TOE] Connected to Chrome on {port}")
     ctx = browser.contexts[0] if browser.contexts else browser.new_context()
@@ -142,6 +240,15 @@ def connect_browser_for_replay(p: Playwright):
 def wait_visible(page, sel: str, timeout: int = 20000):
     page.wait_for_selector(sel, state="visible", timeout=timeout)
 
+def act_on_visible(page, seen: Set[str], sel: str, fn, *args, **kwargs):
+    # Selectors already seen visible on an earlier event skip the explicit wait; the
+    # action's own actionability wait (same 20s budget) covers them in one call.
+    if sel in seen:
+        return fn(sel, *args, timeout=20000, **kwargs)
+    wait_visible(page, sel)
+    seen.add(sel)
+    return fn(sel, *args, **kwargs)
+
 # -------- per-step delay control --------
 class StepDelays:
     def __init__(self, base: float = 0.0, jitter: float = 0.0, after_goto: Optional[float] = None, after_submit: Optional[float] = None):
@@ -161,86 +268,132 @@ class StepDelays:
         if d > 0:
             time.sleep(d)
 
+# -------- step context --------
+class StepContext:
+    # Page/keyboard/delay methods bound once so handlers avoid repeated attribute lookups.
+    __slots__ = ("page", "seen", "dry_run", "log", "sleep", "goto", "click", "fill", "press",
+                 "select_option", "evaluate", "wait_for_load_state", "kbd_press")
+
+    def __init__(self, page, delays: StepDelays, dry_run: bool, log, seen: Set[str]):
+        self.page = page
+        self.seen = seen
+        self.dry_run = dry_run
+        self.log = log
+        self.sleep = delays.sleep
+        if dry_run:
+            return
+        self.goto = page.goto
+        self.click = page.click
+        self.fill = page.fill
+        self.press = page.press
+        self.select_option = page.select_option
+        self.evaluate = page.evaluate
+        self.wait_for_load_state = page.wait_for_load_state
+        self.kbd_press = page.keyboard.press
+
+# -------- step handlers (one per action) --------
+def _do_goto(ctx: StepContext, head: str, s, cf, ev):
+    url = render_compiled(cf.get("url", ""), ev)
+    if ctx.log:
+        ctx.log(f"{head}goto {url}\n")
+    if not ctx.dry_run:
+        ctx.goto(url, wait_until="domcontentloaded")
+        ctx.wait_for_load_state("networkidle")
+    ctx.sleep("goto")
+
+def _do_click(ctx: StepContext, head: str, s, cf, ev):
+    sel = render_compiled(cf["selector"], ev)
+    if ctx.log:
+        ctx.log(f"{head}click {sel}\n")
+    if not ctx.dry_run:
+        act_on_visible(ctx.page, ctx.seen, sel, ctx.click)
+    ctx.sleep("click")
+
+def _do_fill(ctx: StepContext, head: str, s, cf, ev):
+    sel, val = render_compiled(cf["selector"], ev), render_compiled(cf.get("value", ""), ev)
+    if ctx.log:
+        echo = val if len(val) <= 60 else val[:60] + "…"
+        ctx.log(f"{head}fill {sel} = '{echo}'\n")
+    if not ctx.dry_run:
+        act_on_visible(ctx.page, ctx.seen, sel, ctx.fill, val)
+    ctx.sleep("fill")
+
+def _do_press(ctx: StepContext, head: str, s, cf, ev):
+    sel, key = render_compiled(cf["selector"], ev), render_compiled(cf.get("key", "Enter"), ev)
+    if ctx.log:
+        ctx.log(f"{head}press {sel} {key}\n")
+    if not ctx.dry_run:
+        act_on_visible(ctx.page, ctx.seen, sel, ctx.press, key)
+    ctx.sleep("press")
+
+def _do_select(ctx: StepContext, head: str, s, cf, ev):
+    sel, val = render_compiled(cf["selector"], ev), render_compiled(cf.get("value", ""), ev)
+    if ctx.log:
+        ctx.log(f"{head}select {sel} -> {val}\n")
+    if not ctx.dry_run:
+        act_on_visible(ctx.page, ctx.seen, sel, ctx.select_option, value=val)
+    ctx.sleep("select")
+
+def _do_submit(ctx: StepContext, head: str, s, cf, ev):
+    form_sel = render_compiled(cf.get("selector", "form"), ev)
+    if ctx.log:
+        ctx.log(f"{head}submit {form_sel}\n")
+    if not ctx.dry_run:
+        ctx.evaluate("""(sel) => {
+            const f = document.querySelector(sel) || document.querySelector('form');
+            if (f) f.requestSubmit ? f.requestSubmit() : f.submit();
+        }""", form_sel)
+        ctx.wait_for_load_state("networkidle")
+    ctx.sleep("submit")
+
+def _do_tab(ctx: StepContext, head: str, s, cf, ev):
+    count = render_count(cf, s, ev)
+    shift = bool(s.get("shift", False))
+    sel = render_compiled(cf["selector"], ev) if "selector" in cf else None
+    if sel:
+        if ctx.log:
+            ctx.log(f"{head}focus {sel}\n")
+        if not ctx.dry_run:
+            act_on_visible(ctx.page, ctx.seen, sel, ctx.click)
+        ctx.sleep("click")
+    combo = "Shift+Tab" if shift else "Tab"
+    if ctx.log:
+        ctx.log(f"{head}tab x{count}" + (" (reverse)\n" if shift else "\n"))
+    if not ctx.dry_run:
+        press = ctx.kbd_press
+        for _ in range(max(1, count)):
+            press(combo)
+    ctx.sleep("press")
+
+def _do_unknown(ctx: StepContext, head: str, s, cf, ev):
+    a = s.get("action")
+    if ctx.log:
+        ctx.log(f"{head}(skip unknown action '{a}')\n")
+    ctx.sleep(a or "unknown")
+
+_ACTIONS = {
+    "goto": _do_goto,
+    "click": _do_click,
+    "fill": _do_fill,
+    "press": _do_press,
+    "select": _do_select,
+    "submit": _do_submit,
+    "tab": _do_tab,
+}
+
 # -------- step performer (now supports "tab") --------
-def perform_steps(page, steps: List[Dict[str, Any]], delays: StepDelays, dry_run: bool = False, prefix: str = ""):
-    print(f"{prefix}[TOE] Running {len(steps)} actions…")
-    for i, s in enumerate(steps, 1):
-        a = s.get("action")
+def perform_steps(page, compiled_plan: List[Tuple[Any, Dict[str, Any], Dict[str, Any]]], ev: "Event",
+                  delays: StepDelays, dry_run: bool = False, prefix: str = "", quiet: bool = False,
+                  seen_selectors: Optional[Set[str]] = None):
+    # One stdout.write per step; --quiet skips step formatting entirely.
+    log = None if quiet else sys.stdout.write
+    ctx = StepContext(page, delays, dry_run, log, set() if seen_selectors is None else seen_selectors)
+    actions_get = _ACTIONS.get
+    if log:
+        log(f"{prefix}[TOE] Running {len(compiled_plan)} actions…\n")
+    for i, (a, s, cf) in enumerate(compiled_plan, 1):
         try:
-            if a == "goto":
-                url = s.get("url", "")
-                print(f"{prefix}  {i:>3} goto {url}")
-                if not dry_run:
-                    page.goto(url, wait_until="domcontentloaded")
-                    page.wait_for_load_state("networkidle")
-                delays.sleep("goto")
-
-            elif a == "click":
-                sel = s["selector"]
-                print(f"{prefix}  {i:>3} click {sel}")
-                if not dry_run:
-                    wait_visible(page, sel)
-                    page.click(sel)
-                delays.sleep("click")
-
-            elif a == "fill":
-                sel, val = s["selector"], s.get("value", "")
-                echo = val if len(val) <= 60 else val[:60] + "…"
-                print(f"{prefix}  {i:>3} fill {sel} = '{echo}'")
-                if not dry_run:
-                    wait_visible(page, sel)
-                    page.fill(sel, val)
-                delays.sleep("fill")
-
-            elif a == "press":
-                sel, key = s["selector"], s.get("key", "Enter")
-                print(f"{prefix}  {i:>3} press {sel} {key}")
-                if not dry_run:
-                    wait_visible(page, sel)
-                    page.press(sel, key)
-                delays.sleep("press")
-
-            elif a == "select":
-                sel, val = s["selector"], s.get("value", "")
-                print(f"{prefix}  {i:>3} select {sel} -> {val}")
-                if not dry_run:
-                    wait_visible(page, sel)
-                    page.select_option(sel, value=val)
-                delays.sleep("select")
-
-            elif a == "submit":
-                form_sel = s.get("selector", "form")
-                print(f"{prefix}  {i:>3} submit {form_sel}")
-                if not dry_run:
-                    page.evaluate("""(sel) => {
-                        const f = document.querySelector(sel) || document.querySelector('form');
-                        if (f) f.requestSubmit ? f.requestSubmit() : f.submit();
-                    }""", form_sel)
-                    page.wait_for_load_state("networkidle")
-                delays.sleep("submit")
-
-            elif a == "tab":
-                count = int(s.get("count", 1) or 1)
-                shift = bool(s.get("shift", False))
-                sel = s.get("selector")
-                if sel:
-                    print(f"{prefix}  {i:>3} focus {sel}")
-                    if not dry_run:
-                        wait_visible(page, sel)
-                        page.click(sel)
-                    delays.sleep("click")
-                combo = "Shift+Tab" if shift else "Tab"
-                print(f"{prefix}  {i:>3} tab x{count}" + (" (reverse)" if shift else ""))
-                if not dry_run:
-                    for _ in range(max(1, count)):
-                        page.keyboard.press(combo)
-                        time.sleep(0.05)
-                delays.sleep("press")
-
-            else:
-                print(f"{prefix}  {i:>3} (skip unknown action '{a}')")
-                delays.sleep(a or "unknown")
-
+            actions_get(a, _do_unknown)(ctx, f"{prefix}  {i:>3} ", s, cf, ev)
         except Exception as ex:
             print(f"{prefix}  {i:>3} ERROR on action {a}: {ex}")
             ts = int(time.time() * 1000)
@@ -251,8 +404,19 @@ def perform_steps(page, steps: List[Dict[str, Any]], delays: StepDelays, dry_run
             raise
 
 # -------- jira_export_W45.json flattening --------
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+@lru_cache(maxsize=32)
 def _parse_date_key(s: str) -> datetime:
-    return datetime.strptime(s, "%d/%b/%y")
+    # Fixed DD/Mon/YY shape; two-digit years pivot like strptime's %y.
+    d, mon, y = s.split("/")
+    month = _MONTHS.get(mon.lower())
+    if month is None or len(y) != 2:
+        raise ValueError(f"date key {s!r} does not match DD/Mon/YY")
+    year = int(y)
+    year += 2000 if year < 69 else 1900
+    return datetime(year, month, int(d))
 
 def _parse_start_minutes(s: str) -> int:
     try:
@@ -270,45 +434,73 @@ def extract_issue(jira_categories: List[str]) -> str:
         head = head.split(" - ", 1)[0]
     return head.split()[0].strip()
 
+@lru_cache(maxsize=None)
 def minutes_to_hm_str(minutes: int) -> str:
     if minutes < 60:
         return f"{minutes}m"
     h, m = divmod(minutes, 60)
     return f"{h}h {m}m".strip() if m else f"{h}h"
 
-def flatten_jira_export(path: Path, only_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    raw = json.loads(path.read_text(encoding="utf-8"))
+class Event:
+    __slots__ = ("issue", "subject", "date", "duration_minutes", "duration_str",
+                 "date_key", "start", "end", "summary", "is_canceled", "duration_minutes_int")
+
+    def __init__(self, issue: str, subject: str, date: str, duration_minutes: str, duration_str: str,
+                 date_key: str, start: str, end: str, summary: str, is_canceled: bool, duration_minutes_int: int):
+        self.issue = issue
+        self.subject = subject
+        self.date = date
+        self.duration_minutes = duration_minutes
+        self.duration_str = duration_str
+        self.date_key = date_key
+        self.start = start
+        self.end = end
+        self.summary = summary
+        self.is_canceled = is_canceled
+        self.duration_minutes_int = duration_minutes_int
+
+    def __repr__(self) -> str:
+        return "Event(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__) + ")"
+
+def flatten_jira_export(path: Path, only_date: Optional[str] = None) -> List[Event]:
+    raw = load_json_file(path)
     rows: List[Tuple[datetime, int, Dict[str, Any]]] = []
     for date_key, arr in raw.items():
         if only_date and date_key != only_date:
             continue
+        day = _parse_date_key(date_key)
         for entry in arr:
-            rows.append((_parse_date_key(date_key), _parse_start_minutes(entry.get("start", "")), entry))
-    rows.sort(key=lambda x: (x[0], x[1]))
+            rows.append((day, _parse_start_minutes(entry.get("start", "")), entry))
+    rows.sort(key=itemgetter(0, 1))
 
-    events: List[Dict[str, Any]] = []
+    events: List[Event] = []
     for _, __, e in rows:
         minutes = int(e.get("duration_minutes", 0) or 0)
-        vars_ = {
-            "issue": extract_issue(e.get("jira_categories", [])),
-            "subject": e.get("subject", ""),
-            "date": e.get("date") or "",
-            "duration_minutes": str(minutes),
-            "duration_str": minutes_to_hm_str(minutes),
-        }
-        meta = {
-            "date_key": e.get("date") or "",
-            "start": e.get("start", ""),
-            "end": e.get("end", ""),
-            "summary": f"{vars_['date']} {vars_['subject']} -> {vars_['issue']} ({minutes}m)"
-        }
-        events.append({"vars": vars_, "meta": meta})
+        subject = e.get("subject") or ""
+        issue = extract_issue(e.get("jira_categories", []))
+        date = e.get("date") or ""
+        events.append(Event(
+            issue=issue,
+            subject=subject,
+            date=date,
+            duration_minutes=str(minutes),
+            duration_str=minutes_to_hm_str(minutes),
+            date_key=date,
+            start=e.get("start") or "",
+            end=e.get("end") or "",
+            summary=f"{date} {subject} -> {issue} ({minutes}m)",
+            # Outlook prefixes cancellations with "Canceled: ", but tags or dashboard
+            # retitles can push it later in the subject.
+            is_canceled="Canceled: " in subject,
+            duration_minutes_int=minutes,
+        ))
     return events
 
 # -------- batch replay --------
-def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Optional[str], limit: Optional[int], delays: StepDelays):
-    plan: Dict[str, Any] = json.loads(steps_path.read_text(encoding="utf-8"))
-    steps = plan.get("steps", [])
+def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Optional[str], limit: Optional[int], delays: StepDelays,
+                 quiet: bool = False):
+    plan: Dict[str, Any] = load_json_file(steps_path)
+    compiled_plan = compile_plan(plan.get("steps", []))
     events = flatten_jira_export(data_path, only_date=only_date)
     if limit is not None:
         events = events[: max(0, int(limit))]
@@ -336,10 +528,10 @@ def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Op
             return
 
         # Extra gate if any subject contains "Canceled: "
-        canceled = [e for e in events if "Canceled: " in (e.get("vars", {}).get("subject", "") or "")]
+        canceled = [e for e in events if e.is_canceled]
         if canceled:
             canceled_code = _make_code(6, string.digits)
-            preview = [e["vars"].get("subject", "") for e in canceled[:5]]
+            preview = [e.subject for e in canceled[:5]]
 
             lines = [
                 f"{RED}[TOE] Canceled items detected in {data_path.name}.{END}",
@@ -370,10 +562,10 @@ def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Op
 
     # Debug: print one event + list keys
     print("[DEBUG] First event:", events[0])
-    print("[DEBUG] Keys:", list(events[0].keys()))
+    print("[DEBUG] Keys:", list(Event.__slots__))
 
     # ---- Calculate total hours ----
-    total_minutes = sum(int(e["vars"].get("duration_minutes", 0) or 0) for e in events)
+    total_minutes = sum(e.duration_minutes_int for e in events)
     total_hours = total_minutes / 60
     weekly_capacity = 40
 
@@ -384,14 +576,13 @@ def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Op
         browser = None
         try:
             browser, ctx, page = connect_browser_for_replay(p)
-            for idx, item in enumerate(events, 1):
-                vars_ = item["vars"]
-                meta = item["meta"]
-                header = f"[{idx:02d}/{len(events)}] {meta['summary']}"
+            seen_selectors: Set[str] = set()
+            for idx, ev in enumerate(events, 1):
+                header = f"[{idx:02d}/{len(events)}] {ev.summary}"
                 print(f"\n[TOE] {header}")
-                rendered = render_steps(steps, vars_)
                 try:
-                    perform_steps(page, rendered, delays=delays, dry_run=dry_run, prefix=f"[{idx:02d}] ")
+                    perform_steps(page, compiled_plan, ev, delays=delays, dry_run=dry_run, prefix=f"[{idx:02d}] ", quiet=quiet,
+                                  seen_selectors=seen_selectors)
                 except Exception as ex:
                     ts = int(time.time() * 1000)
                     try:
@@ -400,6 +591,7 @@ def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Op
                         pass
                     print(f"[TOE] Aborting on failure at event {idx}: {ex}")
                     raise
+                sys.stdout.flush()
             print("\n[TOE] Batch complete.")
         finally:
             try:
@@ -410,12 +602,21 @@ def batch_replay(steps_path: Path, data_path: Path, dry_run: bool, only_date: Op
 
 # -------- CLI --------
 def main():
+    # Line-buffer only for an interactive console; logs/pipes keep block buffering
+    # and are flushed once per event by batch_replay.
+    if sys.stdout.isatty():
+        try:
+            sys.stdout.reconfigure(line_buffering=True)
+        except Exception:
+            pass
+
     ap = argparse.ArgumentParser(description="TOE batch replayer for Jira export JSON with per-step delays and Tab navigation.")
     ap.add_argument("--replay", metavar="STEPS_JSON", required=True, help="Templated steps.json")
     ap.add_argument("--data", metavar="JIRA_EXPORT_JSON", required=True, help="jira_export_W45.json structure")
     ap.add_argument("--date", metavar="DD/Mon/YY", help="Only items for this date key (e.g., 04/Nov/25)")
     ap.add_argument("--limit", type=int, help="Process at most N items")
     ap.add_argument("--dry-run", action="store_true", help="Print actions without performing them")
+    ap.add_argument("--quiet", action="store_true", help="Do not print individual step actions")
 
     # Delay controls
     ap.add_argument("--delay", type=float, default=0.0, help="Base delay (seconds) after each step")
@@ -425,11 +626,6 @@ def main():
 
     args = ap.parse_args()
 
-    try:
-        sys.stdout.reconfigure(line_buffering=True)
-    except Exception:
-        pass
-
     delays = StepDelays(
         base=args.delay,
         jitter=args.jitter,
@@ -444,6 +640,7 @@ def main():
         only_date=args.date,
         limit=args.limit,
         delays=delays,
+        quiet=args.quiet,
     )
 
 if __name__ == "__main__":
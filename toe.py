@@ -1,88 +1,223 @@
 # file: toe.py
 import os
+import re
 import json
 import argparse
+import hashlib
 import datetime as dt
+from functools import lru_cache
+import threading
+import pythoncom
 import win32com.client
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, Response, request
+
+try:
+    import orjson  # optional: faster JSON encode/decode
+except ImportError:
+    orjson = None
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+def _read_json(path: str):
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+def _write_json(path: str, obj, indent: bool = False):
+    with open(path, "wb") as f:
+        f.write(_json_dumps(obj, indent=indent))
+
+def _write_json_atomic(path: str, obj, indent: bool = False):
+    # readers (the /data route) never see a half-written file
+    tmp = path + ".tmp"
+    _write_json(tmp, obj, indent=indent)
+    os.replace(tmp, path)
+
+def _json_response(obj, status: int = 200, indent: bool = False) -> Response:
+    return Response(_json_dumps(obj, indent=indent), status=status, mimetype="application/json")
+
+def _etag_response(body: bytes, etag: str) -> Response:
+    # pre-encoded JSON that rarely changes; let warm clients revalidate with a 304
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=60"}
+    if etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
 def load_config():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_json(CONFIG_PATH)
 
 CONFIG = load_config()
 
+def _build_token_map(cats):
+    # Outlook category token -> Jira timecodes. Config keys are accepted as tokens
+    # too, but an Outlook category name wins when both spell the same token.
+    token_to_tcs = {}
+    for cfg_key, obj in cats.items():
+        token_to_tcs[cfg_key] = tuple(obj.get("jira_timecodes", []))
+    for cfg_key, obj in cats.items():
+        outlook_name = (obj.get("outlook_category") or cfg_key).strip()
+        token_to_tcs[outlook_name] = token_to_tcs[cfg_key]
+    return token_to_tcs
+
+# config is read once at import, so everything derived from it is built once too
+_TOKEN_TO_TCS = _build_token_map(CONFIG.get("categories", {}))
+_CONFIG_JSON_BYTES = _json_dumps({
+    "categories": CONFIG.get("categories", {}),
+    "palette": CONFIG.get("palette", [])
+})
+_CONFIG_ETAG = hashlib.md5(_CONFIG_JSON_BYTES).hexdigest()
+
+_CAT_SPLIT = re.compile(r"\s*,\s*")  # "A , B,C" -> ["A", "B", "C"] once the ends are stripped
+
 def safe_getattr(obj, attr, default=None):
     try:
         return getattr(obj, attr)
     except Exception:
         return default
 
-def get_week_range(offset_weeks=0):
-    today = dt.datetime.now() - dt.timedelta(weeks=offset_weeks)
-    start_of_week = today - dt.timedelta(days=today.weekday())
-    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+# week ranges only depend on today's date, so they are cached per (date, offset)
+@lru_cache(maxsize=64)
+def _week_range_for(today_date, offset_weeks):
+    day = today_date - dt.timedelta(weeks=offset_weeks)
+    start_of_week = dt.datetime.combine(day - dt.timedelta(days=day.weekday()), dt.time())
     end_of_week = start_of_week + dt.timedelta(days=4, hours=23, minutes=59, seconds=59)
-    week_num = int(start_of_week.strftime("%V"))
+    week_num = start_of_week.isocalendar()[1]
     return start_of_week, end_of_week, week_num
 
-def get_week_label(offset_weeks=0):
-    s, e, w = get_week_range(offset_weeks)
+@lru_cache(maxsize=64)
+def _week_label_for(today_date, offset_weeks):
+    s, e, w = _week_range_for(today_date, offset_weeks)
     return f"Week {w}: {s.strftime('%b %d')} → {e.strftime('%b %d')}", w
 
-def export_week_events(offset_weeks=0):
-    start_of_week, end_of_week, week_num = get_week_range(offset_weeks)
-    print(f"📅 Exporting Outlook events for Week {week_num} ({start_of_week:%b %d} → {end_of_week:%b %d})")
+def get_week_range(offset_weeks=0):
+    return _week_range_for(dt.date.today(), offset_weeks)
+
+def get_week_label(offset_weeks=0):
+    return _week_label_for(dt.date.today(), offset_weeks)
+
+APPT_COLUMNS = ("Subject", "Start", "End", "Categories")
+
+def _dasl_utc(t):
+    # DASL compares dates in UTC; naive local datetimes are converted first.
+    return t.astimezone(dt.timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+def _single_appts_dasl(start, end):
+    q = chr(34)
+    return (
+        f"@SQL={q}urn:schemas:calendar:dtstart{q} >= '{_dasl_utc(start)}' AND "
+        f"{q}urn:schemas:calendar:dtend{q} <= '{_dasl_utc(end)}' AND "
+        f"{q}urn:schemas:calendar:instancetype{q} = 0"
+    )
+
+def _fetch_appointments(calendar, start, end):
+    # Single appointments come from a Table (DASL filter, one batched fetch per row
+    # instead of a COM call per property). Tables don't expand recurring series, so
+    # occurrences still go through Items with IncludeRecurrences and a Jet filter.
+    filter_str = (
+        f"[Start] >= '{start:%m/%d/%Y %I:%M %p}' AND "
+        f"[End] <= '{end:%m/%d/%Y %I:%M %p}'"
+    )
+    rows = []
+    recurring_filter = filter_str
+    try:
+        table = calendar.GetTable(_single_appts_dasl(start, end))
+        table.Columns.RemoveAll()
+        for col in APPT_COLUMNS:
+            table.Columns.Add(col)
+        while not table.EndOfTable:
+            row = table.GetNextRow()
+            try:
+                rows.append(tuple(row.Item(col) for col in APPT_COLUMNS))
+            except Exception:
+                continue
+        recurring_filter = f"{filter_str} AND [IsRecurring] = True"
+    except Exception:
+        rows = []
 
-    outlook = win32com.client.Dispatch("Outlook.Application").GetNamespace("MAPI")
-    calendar = outlook.GetDefaultFolder(9)
     items = calendar.Items
     items.IncludeRecurrences = True
     try:
         items.Sort("[Start]")
     except Exception:
         pass
-
-    filter_str = (
-        f"[Start] >= '{start_of_week:%m/%d/%Y %I:%M %p}' AND "
-        f"[End] <= '{end_of_week:%m/%d/%Y %I:%M %p}'"
-    )
     try:
-        restricted_items = items.Restrict(filter_str)
+        restricted_items = items.Restrict(recurring_filter)
     except Exception:
         restricted_items = items
 
-    events = []
     for appt in restricted_items:
+        rows.append(tuple(safe_getattr(appt, col) for col in APPT_COLUMNS))
+
+    rows = [r for r in rows if r[1] and r[2]]
+    try:
+        rows.sort(key=lambda r: r[1])
+    except Exception:
+        pass
+    return rows
+
+_OUTLOOK = {"ns": None, "cal": None}
+_com_thread = threading.local()
+
+def _get_calendar():
+    # Dispatch Outlook once per process; later weeks reuse the bound calendar folder.
+    if not getattr(_com_thread, "initialized", False):
+        pythoncom.CoInitialize()
+        _com_thread.initialized = True
+    if _OUTLOOK["cal"] is None:
+        ns = win32com.client.Dispatch("Outlook.Application").GetNamespace("MAPI")
+        _OUTLOOK["ns"] = ns
+        _OUTLOOK["cal"] = ns.GetDefaultFolder(9)
+    return _OUTLOOK["cal"]
+
+def export_week_events(offset_weeks=0):
+    start_of_week, end_of_week, week_num = get_week_range(offset_weeks)
+    print(f"📅 Exporting Outlook events for Week {week_num} ({start_of_week:%b %d} → {end_of_week:%b %d})")
+
+    calendar = _get_calendar()
+
+    events = []
+    for subject, start_time, end_time, categories in _fetch_appointments(calendar, start_of_week, end_of_week):
         try:
-            start_time = safe_getattr(appt, "Start")
-            end_time   = safe_getattr(appt, "End")
-            if not start_time or not end_time:
-                continue
             duration = int((end_time - start_time).total_seconds() / 60)
             events.append({
-                "subject": safe_getattr(appt, "Subject", "") or "",
+                "subject": subject or "",
                 "start": start_time.strftime("%a, %b %d %H:%M"),  # "Mon, Nov 03 09:00"
                 "end": end_time.strftime("%H:%M"),
                 "duration_minutes": duration,
-                "categories": safe_getattr(appt, "Categories", "") or "",
-                "date": start_time.strftime("%d/%b/%y")
+                "categories": categories or "",
+                "date": start_time.strftime("%d/%b/%y"),
+                "weekday": start_time.strftime("%a"),         # "Mon"
+                "month_day": start_time.strftime("%b %d"),    # "Nov 03"
+                "hhmm": start_time.strftime("%H:%M"),
             })
         except Exception:
             continue
 
     os.makedirs(DATA_DIR, exist_ok=True)
     file_path = os.path.join(DATA_DIR, f"events_W{week_num}.json")
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "generated_at": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "week_number": week_num,
-            "event_count": len(events),
-            "events": events
-        }, f, indent=2, ensure_ascii=False)
+    # generated_at always differs, so compare only the events themselves
+    try:
+        previous = _read_json(file_path)
+    except (OSError, ValueError):
+        previous = None
+    if isinstance(previous, dict) and previous.get("week_number") == week_num and previous.get("events") == events:
+        print(f"✅ Unchanged {len(events)} events → {file_path}")
+        return file_path
+
+    _write_json_atomic(file_path, {
+        "generated_at": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "week_number": week_num,
+        "event_count": len(events),
+        "events": events
+    })
     print(f"✅ Saved {len(events)} events → {file_path}")
     return file_path
 
@@ -220,10 +355,10 @@ HTML_TEMPLATE = r"""
           <p class="text-xs text-gray-600 mb-1">⏱ <span x-text="(ev.duration_minutes || 0) + 'm'"></span></p>
 
           <!-- Outlook Categories -->
-          <template x-if="(ev.categories || '').trim().length">
+          <template x-if="ev._tokens.length">
             <div class="mt-1 flex flex-wrap items-center gap-2">
               <span class="text-xs text-gray-500">Outlook Categories:</span>
-              <template x-for="(cat, i) in (ev.categories || '').split(',').map(c => c.trim()).filter(Boolean)" :key="ev.event_id + '_cat_' + i">
+              <template x-for="(cat, i) in ev._tokens" :key="ev.event_id + '_cat_' + i">
                 <span class="text-xs font-medium px-2 py-1 rounded bg-gray-100 text-gray-700">
                   <span x-text="cat"></span>
                 </span>
@@ -320,6 +455,14 @@ HTML_TEMPLATE = r"""
 
 <script>
 function app() {
+  // kept outside the reactive object so filling the cache doesn't trigger re-renders
+  const filterCache = { events: null, key: '', list: [] };
+  const jiraCache = new Map();   // __key|cfgVersion -> jira timecodes
+  let cfgVersion = 0;
+  let utilBarRect = null;        // cached until the viewport moves
+  let doneTimer = null;
+  const CAT_SPLIT = /\s*,\s*/;
+
   return {
     // state
     events: [],
@@ -354,6 +497,12 @@ function app() {
     palette: ['#93c5fd','#86efac','#fcd34d','#fca5a5','#a5b4fc','#f9a8d4','#fbbf24','#f87171','#34d399','#60a5fa'],
 
     async init() {
+      const dropRect = () => { utilBarRect = null; };
+      window.addEventListener('resize', dropRect);
+      window.addEventListener('scroll', dropRect, { passive: true });
+      // don't lose a pending debounced doneMap write on reload/close
+      window.addEventListener('beforeunload', () => { if (doneTimer) this.flushDone(); });
+
       const cfgRes = await fetch('/config');
       this.cfg = await cfgRes.json();
       if (Array.isArray(this.cfg.palette) && this.cfg.palette.length) this.palette = this.cfg.palette.slice();
@@ -372,6 +521,8 @@ function app() {
           this.jiraKeyToColor[key] = hex;
         });
       });
+      cfgVersion++;
+      jiraCache.clear();
 
       const res = await fetch('/weeks');
       this.weeks = await res.json();
@@ -386,6 +537,7 @@ function app() {
       const res = await fetch('/data/' + this.selectedWeek);
       const data = await res.json();
       const raw = Array.isArray(data.events) ? data.events : [];
+      jiraCache.clear();
 
       // normalized events
       this.events = raw.map((e, i) => {
@@ -394,16 +546,31 @@ function app() {
         const date = typeof e.date === 'string' ? e.date : '';
         const event_id = `${start}|${end}|${date}`;
         const subject = typeof e.subject === 'string' ? e.subject : '';
+        const categories = typeof e.categories === 'string' ? e.categories : '';
+        // split/map once here; render paths only read these derived fields
+        const tokens = categories.trim().split(CAT_SPLIT).filter(Boolean);
+        // files exported before weekday/month_day existed: derive them from "Mon, Nov 03 09:00"
+        let weekday = e.weekday, monthDay = e.month_day;
+        if (typeof weekday !== 'string' || typeof monthDay !== 'string') {
+          const parts = start.split(',');
+          const chunks = (parts[1] || '').trim().split(/\s+/);
+          weekday = (parts[0] || '').trim().slice(0, 3);
+          monthDay = parts.length >= 2 && chunks.length >= 2 ? `${chunks[0]} ${chunks[1]}` : '';
+        }
         return {
           original_subject: subject,
           subject,
           subject_draft: subject,
           editing: false,
           start, end, date,
-          categories: typeof e.categories === 'string' ? e.categories : '',
+          categories,
           duration_minutes: Number.isFinite(+e.duration_minutes) ? Number(e.duration_minutes) : 0,
           event_id,
           __key: `${event_id}|${i}`,
+          _tokens: tokens,
+          _mapped: Array.from(new Set(tokens.map(t => this.mapTokenToCfg(t)).filter(Boolean))),
+          _weekday: weekday,
+          _monthDay: monthDay,
         };
       });
 
@@ -416,7 +583,7 @@ function app() {
 
       // default to first day with events
       if (this.filteredEvents().length === 0) {
-        const daysWithEvents = this.weekdays.filter(d => this.events.some(e => this.weekdayOf(e) === d));
+        const daysWithEvents = this.weekdays.filter(d => this.events.some(e => e._weekday === d));
         if (daysWithEvents.length) this.selectedDay = daysWithEvents[0];
       }
       this.message = '';
@@ -522,30 +689,31 @@ function app() {
 
     // >>> FIXED: compute segments from mapped cats; compute "needs Jira" count
     computeSummary() {
-      this.summaryMinutes = {};
+      // accumulate into a plain object, then hand it to the reactive state once
+      const sums = {};
       let needs = 0;
 
       for (const e of this.events) {
         const dur = Number(e.duration_minutes || 0);
-        const tokens = (e.categories || '').split(',').map(c => c.trim()).filter(Boolean);
-        const mapped = Array.from(new Set(tokens.map(this.mapTokenToCfg.bind(this)).filter(Boolean)));
+        const mapped = e._mapped;
 
         if (mapped.length === 0) {
           needs += 1;                      // no mapped category → needs Jira
           continue;
         }
         for (const cfgKey of mapped) {
-          this.summaryMinutes[cfgKey] = (this.summaryMinutes[cfgKey] || 0) + dur;
+          sums[cfgKey] = (sums[cfgKey] || 0) + dur;
         }
       }
 
+      this.summaryMinutes = sums;
       this.categorizedCount = needs;
 
       const total = this.totalMinutes();
-      const names = Object.keys(this.summaryMinutes).sort((a,b) => this.summaryMinutes[b] - this.summaryMinutes[a]);
+      const entries = Object.entries(sums);
+      entries.sort((a, b) => b[1] - a[1]);
 
-      this.segments = names.map((cfgKey, idx) => {
-        const minutes = this.summaryMinutes[cfgKey];
+      this.segments = entries.map(([cfgKey, minutes], idx) => {
         const percent = total > 0 ? (minutes / total) * 100 : 0;
         const cfgColor = (this.cfg.categories?.[cfgKey]?.color) || this.palette[idx % this.palette.length];
         return { name: cfgKey, minutes, hours: minutes / 60, percent, color: cfgColor };
@@ -560,24 +728,11 @@ function app() {
     totalHours() { return this.totalMinutes() / 60; },
 
     // day helpers
-    weekdayOf(e) {
-      const token = (e && typeof e.start === 'string') ? e.start.split(',')[0] : '';
-      return (token || '').trim().slice(0,3);
-    },
-    monthDayOf(e) {
-      if (!e || typeof e.start !== 'string') return '';
-      const parts = e.start.split(',');
-      if (parts.length < 2) return '';
-      const rest = parts[1].trim(); // "Nov 03 09:00"
-      const chunks = rest.split(/\s+/);
-      if (chunks.length < 2) return '';
-      return `${chunks[0]} ${chunks[1]}`;
-    },
     rebuildDayLabels() {
       const label = {}, dates = {};
       this.events.forEach(e => {
-        const wd = this.weekdayOf(e);
-        const md = this.monthDayOf(e);
+        const wd = e._weekday;
+        const md = e._monthDay;
         if (wd && md && !label[wd]) label[wd] = md;
         if (wd && (e.date || '') && !dates[wd]) dates[wd] = e.date;
       });
@@ -587,24 +742,33 @@ function app() {
     dayDateLabel(day) { return this.dayLabelMap[day] || ''; },
 
     filteredEvents() {
+      const key = this.selectedDay + '|' + this.showOnlyCategorized;
+      if (filterCache.events === this.events && filterCache.key === key) return filterCache.list;
+      let list;
       try {
-        return this.events.filter(e => {
-          const dayMatch = this.weekdayOf(e) === this.selectedDay;
-          const hasCat = (e.categories || '').trim().length > 0;
+        list = this.events.filter(e => {
+          const dayMatch = e._weekday === this.selectedDay;
+          const hasCat = e._tokens.length > 0;
           return dayMatch && (!this.showOnlyCategorized || hasCat);
         });
       } catch { return []; }
+      filterCache.events = this.events;
+      filterCache.key = key;
+      filterCache.list = list;
+      return list;
     },
 
     jiraMapFor(ev) {
-      const tokens = (ev.categories || '').split(',').map(c => c.trim()).filter(Boolean);
+      const key = ev.__key + '|' + cfgVersion;
+      const hit = jiraCache.get(key);
+      if (hit) return hit;
       const list = [];
-      tokens.forEach(tok => {
-        const cfgKey = this.mapTokenToCfg(tok);
-        if (!cfgKey) return;
+      ev._mapped.forEach(cfgKey => {
         (this.cfgToJira[cfgKey] || []).forEach(tc => list.push(tc));
       });
-      return Array.from(new Set(list));
+      const uniq = Array.from(new Set(list));
+      jiraCache.set(key, uniq);
+      return uniq;
     },
     jiraTagStyle(jira) {
       const key = (jira.split(' - ')[0] || jira).trim();
@@ -612,15 +776,29 @@ function app() {
       return `background:${bg};color:#ffffff`;
     },
 
-    saveDone() { localStorage.setItem('doneMap', JSON.stringify(this.doneMap)); },
+    saveDone() {
+      // coalesce rapid checkbox clicks into one serialize + write
+      clearTimeout(doneTimer);
+      doneTimer = setTimeout(() => this.flushDone(), 200);
+    },
+    flushDone() {
+      clearTimeout(doneTimer);
+      doneTimer = null;
+      localStorage.setItem('doneMap', JSON.stringify(this.doneMap));
+    },
     loadDone() { try { this.doneMap = JSON.parse(localStorage.getItem('doneMap')) || {}; } catch { this.doneMap = {}; } },
 
     // Tooltip
-    showSeg(seg, ev) { this.hoverSeg = { name: seg.name, hours: seg.hours, percent: seg.percent }; this.moveTooltip(ev); },
+    showSeg(seg, ev) {
+      this.hoverSeg = { name: seg.name, hours: seg.hours, percent: seg.percent };
+      utilBarRect = this.$refs.utilBar ? this.$refs.utilBar.getBoundingClientRect() : null;
+      this.moveTooltip(ev);
+    },
     moveTooltip(ev) {
       const wrap = this.$refs.utilBar;
       if (!wrap || !this.hoverSeg) return;
-      const rect = wrap.getBoundingClientRect();
+      // reading the rect forces layout; only do it again after a resize/scroll
+      const rect = utilBarRect || (utilBarRect = wrap.getBoundingClientRect());
       const pointerX = ev.clientX - rect.left;
       const tipWidth = 160, half = tipWidth/2, minX = 6+half, maxX = rect.width-6-half;
       const center = Math.max(minX, Math.min(maxX, pointerX));
@@ -634,25 +812,32 @@ function app() {
 </html>
 """
 
+# the page has no Jinja markup, so it is served as-is without a template render
+_INDEX_BYTES = HTML_TEMPLATE.encode("utf-8")
+
 # ---------------------------- Routes ---------------------------------
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    return Response(_INDEX_BYTES, mimetype="text/html")
 
 @app.route("/config")
 def serve_config():
-    return jsonify({
-        "categories": CONFIG.get("categories", {}),
-        "palette": CONFIG.get("palette", [])
-    })
+    return _etag_response(_CONFIG_JSON_BYTES, _CONFIG_ETAG)
+
+_WEEKS_CACHE = (None, b"", "")  # (date, encoded /weeks payload, etag)
 
 @app.route("/weeks")
 def list_weeks():
-    weeks = []
-    for i in range(0, 6):
-        label, wnum = get_week_label(i)
-        weeks.append({"week": wnum, "label": label})
-    return jsonify(weeks)
+    global _WEEKS_CACHE
+    today = dt.date.today()
+    if _WEEKS_CACHE[0] != today:
+        weeks = []
+        for i in range(0, 6):
+            label, wnum = _week_label_for(today, i)
+            weeks.append({"week": wnum, "label": label})
+        body = _json_dumps(weeks)
+        _WEEKS_CACHE = (today, body, hashlib.md5(body).hexdigest())
+    return _etag_response(_WEEKS_CACHE[1], _WEEKS_CACHE[2])
 
 def _edits_path(week_num: int) -> str:
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -662,60 +847,72 @@ def _load_edits(week_num: int):
     path = _edits_path(week_num)
     if not os.path.exists(path):
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        return data.get("edits", {}) if isinstance(data, dict) else {}
+    data = _read_json(path)
+    return data.get("edits", {}) if isinstance(data, dict) else {}
 
 def _save_edits(week_num: int, edits: dict):
     path = _edits_path(week_num)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"edits": edits}, f, indent=2)
+    _write_json(path, {"edits": edits})
 
 @app.route("/edits/<int:week_num>", methods=["GET", "POST"])
 def edits_api(week_num):
     if request.method == "GET":
-        return jsonify({"edits": _load_edits(week_num)})
+        return _json_response({"edits": _load_edits(week_num)})
     data = request.get_json(silent=True) or {}
     event_id = data.get("event_id")
     subject = (data.get("subject") or "").strip()
     if not event_id or not subject:
-        return jsonify({"message": "event_id and subject required"}), 400
+        return _json_response({"message": "event_id and subject required"}, 400)
     edits = _load_edits(week_num)
     edits[event_id] = {"subject": subject}
     _save_edits(week_num, edits)
-    return jsonify({"message": "Saved", "edits": edits})
+    return _json_response({"message": "Saved", "edits": edits})
+
+_events_cache = {}  # week_num -> (mtime_ns, parsed events file)
+
+def _load_events(week_num: int):
+    path = os.path.join(DATA_DIR, f"events_W{week_num}.json")
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    hit = _events_cache.get(week_num)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    data = _read_json(path)
+    _events_cache[week_num] = (mtime, data)
+    return data
 
 @app.route("/data/<int:week_num>")
 def serve_data(week_num):
-    file_path = os.path.join(DATA_DIR, f"events_W{week_num}.json")
-    if not os.path.exists(file_path):
-        return jsonify({"events": []})
-    with open(file_path, "r", encoding="utf-8") as f:
-        return jsonify(json.load(f))
+    data = _load_events(week_num)
+    if data is None:
+        return _json_response({"events": []})
+    return _json_response(data, indent=request.args.get("pretty") == "1")
 
 @app.route("/generate_json/<int:week_num>", methods=["POST"])
 def generate_json(week_num):
-    file_path = os.path.join(DATA_DIR, f"events_W{week_num}.json")
-    if not os.path.exists(file_path):
-        return jsonify({"message": f"No events file found for week {week_num}"}), 404
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _load_events(week_num)
+    if data is None:
+        return _json_response({"message": f"No events file found for week {week_num}"}, 404)
 
     # mappings
     cats = CONFIG.get("categories", {})
-    outlook_to_cfg, cfg_to_jira = {}, {}
-    for cfg_key, obj in cats.items():
-        outlook_name = (obj.get("outlook_category") or cfg_key).strip()
-        outlook_to_cfg[outlook_name] = cfg_key
-        cfg_to_jira[cfg_key] = list(obj.get("jira_timecodes", []))
 
     # PTO payload
     pto_payload = request.get_json(silent=True) or {}
     pto_rows = pto_payload.get("pto") or []
-    pto_full_dates = set([r["date"] for r in pto_rows if r.get("status") == "full" and r.get("date")])
-    pto_partial_hours = {r["date"]: float(r.get("hours", 0)) for r in pto_rows if r.get("status") == "half" and r.get("date")}
-    pto_reason_by_date = {r["date"]: (r.get("reason") or "PTO") for r in pto_rows if r.get("date")}
+    pto_full_dates, pto_partial_hours, pto_reason_by_date = set(), {}, {}
+    for r in pto_rows:
+        d = r.get("date")
+        if not d:
+            continue
+        pto_reason_by_date[d] = r.get("reason") or "PTO"
+        status = r.get("status")
+        if status == "full":
+            pto_full_dates.add(d)
+        elif status == "half":
+            pto_partial_hours[d] = float(r.get("hours", 0))
 
     # PTO timecode from config
     pto_cfg = cats.get("PTO or Sick") or {}
@@ -739,13 +936,12 @@ def generate_json(week_num):
         event_id = f"{start}|{end}|{date_str}"
         subject = (edits.get(event_id, {}) or {}).get("subject", e.get("subject", ""))
 
-        tokens = [c.strip() for c in (e.get("categories") or "").split(",") if c.strip()]
-        mapped_timecodes = []
-        for tok in tokens:
-            cfg_key = outlook_to_cfg.get(tok) or (tok if tok in cfg_to_jira else None)
-            if not cfg_key:
-                continue
-            mapped_timecodes.extend(cfg_to_jira.get(cfg_key, []))
+        seen, mapped_timecodes = set(), []
+        for tok in _CAT_SPLIT.split((e.get("categories") or "").strip()):
+            for tc in _TOKEN_TO_TCS.get(tok, ()):
+                if tc not in seen:
+                    seen.add(tc)
+                    mapped_timecodes.append(tc)
         if not mapped_timecodes:
             continue
 
@@ -785,10 +981,9 @@ def generate_json(week_num):
         included_count += 1
 
     out_path = os.path.join(DATA_DIR, f"jira_export_W{week_num}.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(grouped, f, indent=2)
+    _write_json(out_path, grouped, indent=True)
 
-    return jsonify({"message": f"✅ Jira JSON saved to {out_path} ({included_count} entries incl. edits & PTO)"})
+    return _json_response({"message": f"✅ Jira JSON saved to {out_path} ({included_count} entries incl. edits & PTO)"})
 
 
 def main():
@@ -3,10 +3,14 @@
 import argparse
 import ctypes
 import json
+import logging
 import os
+import queue
 import sys
+import threading
 import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 
@@ -18,10 +22,17 @@ except Exception as e:
     print("ERROR: pywin32 is required. Install with:  pip install pywin32", file=sys.stderr)
     raise
 
+try:
+    import orjson  # optional: faster JSON encode/decode
+except ImportError:
+    orjson = None
+
 # ---------- Tkinter UI ----------
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+log = logging.getLogger("toe")
+
 APP_STATE_DIR = Path(os.environ.get("LOCALAPPDATA", ".")) / "TOE"
 APP_STATE_DIR.mkdir(parents=True, exist_ok=True)
 STATE_PATH = APP_STATE_DIR / "state.json"
@@ -35,55 +46,99 @@ DEFAULTS = {
 }
 
 # ---------- Config & State ----------
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+_JSON_CACHE: Dict[str, Tuple[int, dict]] = {}  # path -> (st_mtime_ns, parsed)
+
 def _try_load_json(p: Path):
-    if not p.exists():
+    try:
+        mtime = p.stat().st_mtime_ns
+    except OSError:
         return None, f"not found: {p}"
+    hit = _JSON_CACHE.get(str(p))
+    if hit and hit[0] == mtime:
+        return hit[1], None
     try:
-        return json.loads(p.read_text(encoding="utf-8")), None
+        data = _json_loads(p.read_bytes())
     except Exception as e:
         return None, f"failed to parse {p}: {e}"
+    _JSON_CACHE[str(p)] = (mtime, data)
+    return data, None
 
 def _merge_defaults(over: dict) -> dict:
-    cfg = json.loads(json.dumps(DEFAULTS))  # deep copy
-    for k, v in (over or {}).items():
-        cfg[k] = v
-    cfg.setdefault("categories", {})
-    cfg.setdefault("outlook", {}).setdefault("tz_id", None)
+    # fresh dicts per section; a partial section in config.json keeps the other defaults
+    over = over or {}
+    cfg = dict(over)
+    for section in ("work_window", "prompt_rules", "ui", "outlook"):
+        cfg[section] = {**DEFAULTS[section], **(over.get(section) or {})}
+    cfg["categories"] = over.get("categories") or {}
+    # derived once here, reused by every prompt
+    cfg["_cat_names_sorted"] = sorted(cfg["categories"].keys())
+    cfg["_tc_by_cat"] = {name: tuple(cat.get("jira_timecodes") or ()) for name, cat in cfg["categories"].items()}
+    rules = cfg["prompt_rules"]
+    cfg["_focus_title"] = rules.get("focus_title", "Focus Sprint") or ""
+    cfg["_focus_title_lower"] = cfg["_focus_title"].lower()
+    cfg["_focus_mode"] = rules.get("focus_match", "equals_ci")
+    sh, sm = parse_hhmm(cfg["work_window"]["start"])
+    eh, em = parse_hhmm(cfg["work_window"]["end"])
+    cfg["_wwin_start_min"], cfg["_wwin_end_min"] = sh * 60 + sm, eh * 60 + em
     return cfg
 
-def load_config(cli_path: Optional[str], debug=False) -> dict:
+def load_config(cli_path: Optional[str]) -> dict:
     if cli_path:
         cfg, err = _try_load_json(Path(cli_path))
         if cfg:
-            if debug: print(f"[TOE] loaded config from --config: {cli_path}")
+            log.debug("loaded config from --config: %s", cli_path)
             return _merge_defaults(cfg)
-        if debug: print(f"[TOE] {err}")
+        log.debug("%s", err)
 
     here = Path(__file__).resolve().parent / "config.json"
     cfg, err = _try_load_json(here)
     if cfg:
-        if debug: print(f"[TOE] loaded config from script dir: {here}")
+        log.debug("loaded config from script dir: %s", here)
         return _merge_defaults(cfg)
 
     cwd = Path.cwd() / "config.json"
     cfg, err = _try_load_json(cwd)
     if cfg:
-        if debug: print(f"[TOE] loaded config from CWD: {cwd}")
+        log.debug("loaded config from CWD: %s", cwd)
         return _merge_defaults(cfg)
 
-    if debug: print("[TOE] no config found; using defaults")
+    log.debug("no config found; using defaults")
     return _merge_defaults({})
 
+# state is read once per process; save_state only touches disk when the content changed
+_STATE: Optional[dict] = None
+_STATE_BYTES: Optional[bytes] = None
+
 def load_state() -> dict:
+    global _STATE, _STATE_BYTES
+    if _STATE is not None:
+        return _STATE
     if STATE_PATH.exists():
         try:
-            return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+            data = STATE_PATH.read_bytes()
+            _STATE, _STATE_BYTES = _json_loads(data), data
+            return _STATE
         except Exception:
             pass
-    return {"last_category": None, "last_timecode": None, "snooze_until": None}
+    _STATE = {"last_category": None, "last_timecode": None, "snooze_until": None}
+    return _STATE
 
 def save_state(st: dict):
-    STATE_PATH.write_text(json.dumps(st, indent=2), encoding="utf-8")
+    global _STATE, _STATE_BYTES
+    _STATE = st
+    data = _json_dumps(st)
+    if data == _STATE_BYTES:
+        return
+    STATE_PATH.write_bytes(data)
+    _STATE_BYTES = data
 
 # ---------- Time Helpers ----------
 def parse_hhmm(s: str) -> Tuple[int, int]:
@@ -93,114 +148,188 @@ def parse_hhmm(s: str) -> Tuple[int, int]:
 def now_local() -> datetime:
     return datetime.now()
 
+@lru_cache(maxsize=4)
+def _slot_from_key(key: Tuple[int, int, int, int, int], slot_minutes: int) -> Tuple[datetime, datetime]:
+    y, mo, d, h, idx = key
+    start = datetime(y, mo, d, h, idx * slot_minutes)
+    return start, start + timedelta(minutes=slot_minutes)
+
 def current_slot(slot_minutes: int) -> Tuple[datetime, datetime]:
+    # the result only changes once per slot, so every tick inside it hits the cache
     n = now_local()
-    minute = (0 if n.minute < 30 else 30) if slot_minutes == 30 else (n.minute // slot_minutes) * slot_minutes
-    start = n.replace(minute=minute, second=0, microsecond=0)
-    end = start + timedelta(minutes=slot_minutes)
-    return start, end
+    return _slot_from_key((n.year, n.month, n.day, n.hour, n.minute // slot_minutes), slot_minutes)
 
 def within_work_window(cfg: dict, t: datetime) -> bool:
-    sh, sm = parse_hhmm(cfg["work_window"]["start"])
-    eh, em = parse_hhmm(cfg["work_window"]["end"])
-    s = t.replace(hour=sh, minute=sm, second=0, microsecond=0)
-    e = t.replace(hour=eh, minute=em, second=0, microsecond=0)
-    return s <= t < e
+    # bounds are whole minutes, so comparing minute-of-day matches the datetime compare
+    m = t.hour * 60 + t.minute
+    return cfg["_wwin_start_min"] <= m < cfg["_wwin_end_min"]
 
 # ---------- Outlook ----------
+_outlook_ctx: Dict[str, object] = {}  # app / calendar / items, opened on first use
+
 def outlook_open_default_calendar():
-    pythoncom.CoInitialize()
-    app = win32com.client.Dispatch("Outlook.Application")
-    outlook_ns = app.GetNamespace("MAPI")
-    calendar = outlook_ns.GetDefaultFolder(9)  # olFolderCalendar
-    items = calendar.Items
-    items.IncludeRecurrences = True
-    items.Sort("[Start]")
-    return app, calendar, items
+    # Dispatch once per process; the Items collection is sorted here and nowhere else.
+    # Only called on the Outlook worker thread, which owns the COM apartment.
+    if not _outlook_ctx:
+        app = win32com.client.Dispatch("Outlook.Application")
+        outlook_ns = app.GetNamespace("MAPI")
+        calendar = outlook_ns.GetDefaultFolder(9)  # olFolderCalendar
+        items = calendar.Items
+        items.IncludeRecurrences = True
+        items.Sort("[Start]")
+        _outlook_ctx.update(app=app, calendar=calendar, items=items)
+    return _outlook_ctx["app"], _outlook_ctx["calendar"], _outlook_ctx["items"]
 
 def ol_time_str(dt: datetime) -> str:
     return dt.strftime("%m/%d/%Y %H:%M")
 
-def events_in_range(items, start: datetime, end: datetime):
+def _is_focus_title(subject: str, cfg: dict) -> bool:
+    # subject arrives stripped; the configured title is pre-lowered at config load
+    mode = cfg["_focus_mode"]
+    if mode == "equals_ci":
+        return subject.lower() == cfg["_focus_title_lower"]
+    if mode == "contains_ci":
+        return cfg["_focus_title_lower"] in subject.lower()
+    return subject == cfg["_focus_title"]
+
+SCAN_COLUMNS = ("EntryID", "Subject", "Start", "End", "AllDayEvent", "BusyStatus")
+ITEM_COLUMNS = "Subject, Start, End, AllDayEvent, BusyStatus"
+
+def _dasl_time_str(dt: datetime) -> str:
+    # DASL compares calendar dates in UTC.
+    return _to_utc_from_local_wall(dt).strftime("%Y-%m-%d %H:%M")
+
+def _single_appts_dasl(start: datetime, end: datetime) -> str:
+    q = chr(34)
+    return (
+        f"@SQL={q}urn:schemas:calendar:dtstart{q} < '{_dasl_time_str(end)}' AND "
+        f"{q}urn:schemas:calendar:dtend{q} > '{_dasl_time_str(start)}' AND "
+        f"{q}urn:schemas:calendar:alldayevent{q} = 0 AND "
+        f"{q}urn:schemas:calendar:instancetype{q} = 0"
+    )
+
+def scan_slot(items, cfg: dict, start: datetime, end: datetime) -> Tuple[List[dict], List]:
+    """One pass over the slot: event dicts for the prompt rules, plus the raw
+    Focus Sprint items (occurrences only) that a save would replace."""
+    events, focus_items = [], []
+
+    # Single appointments come from a Table: only the listed columns are marshalled,
+    # no AppointmentItem is materialized unless it is a focus item we may delete.
+    # Tables don't expand recurring series, so occurrences still go through Items.
     # Exclude all-day events to avoid false blocks.
     restriction = (
         f"[Start] < '{ol_time_str(end)}' AND "
         f"[End] > '{ol_time_str(start)}' AND "
         f"[AllDayEvent] = False"
     )
+    try:
+        table = items.Parent.GetTable(_single_appts_dasl(start, end))
+        table.Columns.RemoveAll()
+        for col in SCAN_COLUMNS:
+            table.Columns.Add(col)
+        while not table.EndOfTable:
+            row = table.GetNextRow()
+            try:
+                entry_id, subject, s, e, all_day, busy = (row.Item(col) for col in SCAN_COLUMNS)
+                if all_day:
+                    continue
+                subject = str(subject or "").strip()
+                events.append({"Subject": subject, "Start": s, "End": e,
+                               "BusyStatus": int(busy) if busy is not None else None})
+                if _is_focus_title(subject, cfg):
+                    focus_items.append(items.Session.GetItemFromID(entry_id))
+            except Exception:
+                log.exception("skipping unreadable calendar row")
+                continue
+        restriction += " AND [IsRecurring] = True"
+    except Exception:
+        events, focus_items = [], []
+
     try:
         restricted = items.Restrict(restriction)
     except Exception:
-        items.Sort("[Start]")
-        restricted = items.Restrict(f"[Start] < '{ol_time_str(end)}' AND [End] > '{ol_time_str(start)}'")
+        # some Exchange versions reject the AllDayEvent clause; the loop below filters it anyway
+        restriction = restriction.replace(" AND [AllDayEvent] = False", "")
+        restricted = items.Restrict(restriction)
 
-    out = []
+    # Have Outlook prefetch just the properties we read instead of one call per property.
+    # Projected items can't be deleted, so focus matches are re-fetched unprojected below.
+    try:
+        restricted.SetColumns(ITEM_COLUMNS)
+        projected = True
+    except Exception:
+        projected = False
+
+    refetch_focus = False
     for itm in restricted:
         try:
             if bool(getattr(itm, "AllDayEvent", False)):
                 continue
-            out.append({
-                "Subject": str(itm.Subject or "").strip(),
+            subject = str(itm.Subject or "").strip()
+            busy = itm.BusyStatus
+            events.append({
+                "Subject": subject,
                 "Start": itm.Start,
                 "End": itm.End,
-                "BusyStatus": int(itm.BusyStatus) if hasattr(itm, "BusyStatus") else None
+                "BusyStatus": int(busy) if busy is not None else None
             })
+            if _is_focus_title(subject, cfg):
+                if projected:
+                    refetch_focus = True
+                else:
+                    focus_items.append(itm)
         except Exception:
+            log.exception("skipping unreadable calendar item")
             continue
-    return out
 
-def _is_focus_title(subject: str, focus_title: str, mode: str) -> bool:
-    s = (subject or "").strip()
-    ft = focus_title or ""
-    if mode == "equals_ci":
-        return s.lower() == ft.lower()
-    if mode == "contains_ci":
-        return ft.lower() in s.lower()
-    return s == ft
+    if refetch_focus:
+        for itm in items.Restrict(restriction):
+            try:
+                if not bool(itm.AllDayEvent) and _is_focus_title(str(itm.Subject or "").strip(), cfg):
+                    focus_items.append(itm)
+            except Exception:
+                log.exception("skipping unreadable calendar item")
+                continue
+    return events, focus_items
 
-def find_focus_occurrences(items, slot_start: datetime, slot_end: datetime, cfg: dict) -> List:
-    """Return raw Outlook items within slot that match the configured focus title (occurrences only)."""
-    rules = cfg["prompt_rules"]
-    restriction = (
-        f"[Start] < '{ol_time_str(slot_end)}' AND "
-        f"[End] > '{ol_time_str(slot_start)}' AND "
-        f"[AllDayEvent] = False"
-    )
-    try:
-        restricted = items.Restrict(restriction)
-    except Exception:
-        items.Sort("[Start]")
-        restricted = items.Restrict(f"[Start] < '{ol_time_str(slot_end)}' AND [End] > '{ol_time_str(slot_start)}'")
+_LAST_SCAN: Tuple[Optional[str], Optional[Tuple[List[dict], List]]] = (None, None)  # (slot_key, scan)
 
-    matches = []
-    for itm in restricted:
-        try:
-            if bool(getattr(itm, "AllDayEvent", False)):
-                continue
-            if _is_focus_title(
-                str(getattr(itm, "Subject", "") or ""),
-                rules.get("focus_title", "Focus Sprint"),
-                rules.get("focus_match", "equals_ci"),
-            ):
-                matches.append(itm)
-        except Exception:
-            continue
-    return matches
+def scan_slot_cached(items, cfg: dict, start: datetime, end: datetime) -> Tuple[List[dict], List]:
+    """scan_slot, reusing the previous result when the same slot is asked for again."""
+    global _LAST_SCAN
+    key = f"{start:%Y-%m-%d %H:%M}|{end:%H:%M}"
+    if _LAST_SCAN[0] != key:
+        _LAST_SCAN = (key, scan_slot(items, cfg, start, end))
+    return _LAST_SCAN[1]
+
+def forget_scan():
+    # called after we change the calendar ourselves, and before re-prompting after a snooze
+    global _LAST_SCAN
+    _LAST_SCAN = (None, None)
 
 # --- Appointment creation: StartUTC only (prevents offset drift) ---
-def _local_tz():
-    return datetime.now().astimezone().tzinfo
+# Local zone is resolved once and re-read whenever DST flips (checked every scheduler tick).
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+_LOCAL_OFFSET = _LOCAL_TZ.utcoffset(None)
+_LOCAL_ISDST = time.localtime().tm_isdst
+
+def refresh_local_tz():
+    global _LOCAL_TZ, _LOCAL_OFFSET, _LOCAL_ISDST
+    isdst = time.localtime().tm_isdst
+    if isdst == _LOCAL_ISDST:
+        return
+    _LOCAL_TZ = datetime.now().astimezone().tzinfo
+    _LOCAL_OFFSET = _LOCAL_TZ.utcoffset(None)
+    _LOCAL_ISDST = isdst
 
 def _to_utc_from_local_wall(dt_local_naive: datetime) -> datetime:
-    aware_local = dt_local_naive.replace(tzinfo=_local_tz())
-    return aware_local.astimezone(timezone.utc)
+    return (dt_local_naive - _LOCAL_OFFSET).replace(tzinfo=timezone.utc)
 
 def _local_and_utc(dt_naive_local: datetime) -> Tuple[datetime, datetime]:
-    aware_local = dt_naive_local.replace(tzinfo=_local_tz())
-    return aware_local, aware_local.astimezone(timezone.utc)
+    return dt_naive_local.replace(tzinfo=_LOCAL_TZ), _to_utc_from_local_wall(dt_naive_local)
 
 def create_appointment(app, calendar, start: datetime, end: datetime, subject: str,
-                       outlook_category: Optional[str], debug: bool=False):
+                       outlook_category: Optional[str]):
     appt = calendar.Items.Add(1)  # olAppointmentItem
     appt.StartUTC = _to_utc_from_local_wall(start)
     appt.EndUTC = _to_utc_from_local_wall(end)
@@ -212,53 +341,121 @@ def create_appointment(app, calendar, start: datetime, end: datetime, subject: s
         except Exception:
             pass
     appt.Save()
-    if debug:
+    if log.isEnabledFor(logging.DEBUG):
         try:
-            print(f"[TOE] saved appt: Start={appt.Start}  End={appt.End}  "
-                  f"StartUTC={getattr(appt, 'StartUTC', None)}  EndUTC={getattr(appt, 'EndUTC', None)}")
+            log.debug("saved appt: Start=%s  End=%s  StartUTC=%s  EndUTC=%s",
+                      appt.Start, appt.End, getattr(appt, "StartUTC", None), getattr(appt, "EndUTC", None))
         except Exception:
             pass
 
 # ---------- Prompt Rules ----------
-def should_prompt(cfg: dict, items, slot_start: datetime, slot_end: datetime, debug=False) -> bool:
+def should_prompt(cfg: dict, evs: List[dict], slot_start: datetime, slot_end: datetime) -> bool:
     """Prompt iff slot empty OR exactly one event and it's Focus Sprint."""
-    evs = events_in_range(items, slot_start, slot_end)
-    if debug:
-        print(f"[TOE] slot {slot_start:%H:%M}-{slot_end:%H:%M} events={len(evs)} :: {[e['Subject'] for e in evs]}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("slot %s-%s events=%d :: %s", f"{slot_start:%H:%M}", f"{slot_end:%H:%M}",
+                  len(evs), [e["Subject"] for e in evs])
     if not evs:
         return True
-    if len(evs) == 1 and _is_focus_title(
-        evs[0]["Subject"],
-        cfg["prompt_rules"].get("focus_title", "Focus Sprint"),
-        cfg["prompt_rules"].get("focus_match", "equals_ci"),
-    ):
+    if len(evs) == 1 and _is_focus_title(evs[0]["Subject"], cfg):
         return True
     return False
 
+# ---------- Outlook worker ----------
+# All COM objects live on one background thread; the scheduler/Tk thread sends it
+# (fn, args, reply_q) requests and only plain dicts come back.
+OUTLOOK_TIMEOUT_SEC = 30  # generous enough for a cold Outlook start
+_OL_QUEUE: "queue.Queue" = queue.Queue()
+_ol_thread: Optional[threading.Thread] = None
+
+def _outlook_worker():
+    pythoncom.CoInitializeEx(pythoncom.COINIT_APARTMENTTHREADED)
+    while True:
+        fn, args, reply_q = _OL_QUEUE.get()
+        try:
+            res = (True, fn(*args))
+        except Exception as ex:
+            res = (False, ex)
+        if reply_q is not None:
+            reply_q.put(res)
+        elif not res[0]:
+            log.error("Outlook request failed", exc_info=res[1])
+
+def _ol_submit(fn, *args, wait: bool=True, timeout: Optional[float]=OUTLOOK_TIMEOUT_SEC):
+    """Run fn(*args) on the Outlook thread. With wait=False it is fire-and-forget;
+    otherwise block for the result (queue.Empty on timeout) and re-raise its errors."""
+    global _ol_thread
+    if _ol_thread is None:
+        _ol_thread = threading.Thread(target=_outlook_worker, name="outlook", daemon=True)
+        _ol_thread.start()
+    if not wait:
+        _OL_QUEUE.put((fn, args, None))
+        return None
+    reply_q = queue.Queue(maxsize=1)
+    _OL_QUEUE.put((fn, args, reply_q))
+    ok, val = reply_q.get(timeout=timeout)
+    if not ok:
+        raise val
+    return val
+
+def _ol_drain(timeout: Optional[float]=None):
+    # requests run in order, so a no-op round-trip means everything posted before it is done
+    if _ol_thread is not None:
+        try:
+            _ol_submit(lambda: None, timeout=timeout)
+        except queue.Empty:
+            log.warning("Outlook requests still pending at exit")
+
 # ---------- Idle detection ----------
 class LASTINPUTINFO(ctypes.Structure):
     _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
 
+# Bound once with explicit signatures; the scheduler calls these on every idle check.
+_GetLastInputInfo = ctypes.WinDLL("user32").GetLastInputInfo
+_GetLastInputInfo.argtypes = [ctypes.POINTER(LASTINPUTINFO)]
+_GetLastInputInfo.restype = ctypes.c_int
+_GetTickCount = ctypes.WinDLL("kernel32").GetTickCount
+_GetTickCount.argtypes = []
+_GetTickCount.restype = ctypes.c_uint32
+
+_LII = LASTINPUTINFO()
+_LII.cbSize = ctypes.sizeof(LASTINPUTINFO)
+_LII_REF = ctypes.byref(_LII)
+
 def get_idle_seconds() -> float:
-    lii = LASTINPUTINFO()
-    lii.cbSize = ctypes.sizeof(LASTINPUTINFO)
-    if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(lii)) == 0:
+    _LII.dwTime = 0
+    if _GetLastInputInfo(_LII_REF) == 0:
         return 0.0
-    millis = ctypes.windll.kernel32.GetTickCount() - lii.dwTime
+    millis = (_GetTickCount() - _LII.dwTime) & 0xFFFFFFFF  # tick count wraps every ~49.7 days
     return millis / 1000.0
 
 # ---------- Tkinter Modal ----------
+_tk_root: Optional[tk.Tk] = None  # one hidden root for the process; prompts are Toplevels
+
+def _close_tk():
+    global _tk_root
+    if _tk_root is not None:
+        try:
+            _tk_root.destroy()
+        except tk.TclError:
+            pass
+        _tk_root = None
+
 def run_modal_tk(slot_start: datetime, slot_end: datetime, categories: Dict[str, dict],
-                 remember: Dict[str, Optional[str]], snooze_minutes: int) -> dict:
+                 remember: Dict[str, Optional[str]], snooze_minutes: int,
+                 cat_names: Optional[List[str]] = None,
+                 tc_by_cat: Optional[Dict[str, tuple]] = None) -> dict:
     """
     Returns one of:
       {"action":"save","text":..., "category":..., "timecode":...}
       {"action":"skip"}
       {"action":"snooze"}
     """
+    global _tk_root
     result = {"action": "skip"}
 
-    root = tk.Tk(); root.withdraw()
+    if _tk_root is None:
+        _tk_root = tk.Tk(); _tk_root.withdraw()
+    root = _tk_root
     win = tk.Toplevel(root)
     win.title("What are you working on now?")
     win.attributes("-topmost", True)
@@ -278,7 +475,10 @@ def run_modal_tk(slot_start: datetime, slot_end: datetime, categories: Dict[str,
     ttk.Label(frm, text="Category").grid(row=4, column=0, sticky="w")
     ttk.Label(frm, text="JIRA timecode").grid(row=4, column=1, sticky="w", padx=(8, 0))
 
-    cat_names = sorted(categories.keys())
+    if cat_names is None:
+        cat_names = sorted(categories.keys())
+    if tc_by_cat is None:
+        tc_by_cat = {name: tuple(cat.get("jira_timecodes") or ()) for name, cat in categories.items()}
     cat_var = tk.StringVar(); code_var = tk.StringVar()
 
     cat_cb = ttk.Combobox(frm, textvariable=cat_var, values=cat_names, state="readonly", width=30)
@@ -291,8 +491,7 @@ def run_modal_tk(slot_start: datetime, slot_end: datetime, categories: Dict[str,
     elif cat_names: cat_var.set(cat_names[0])
 
     def refresh_timecodes():
-        sel = cat_var.get()
-        tcs = categories.get(sel, {}).get("jira_timecodes", [])
+        tcs = tc_by_cat.get(cat_var.get(), ())
         code_cb.config(values=tcs)
         last_code = remember.get("last_timecode")
         if last_code in tcs: code_var.set(last_code)
@@ -320,10 +519,13 @@ def run_modal_tk(slot_start: datetime, slot_end: datetime, categories: Dict[str,
     win.geometry(f"+{int((sw - w) / 2)}+{int((sh - h) / 3)}")
     win.after(100, lambda: txt.focus_set())
 
-    root.deiconify(); root.wait_window(win); root.destroy()
+    root.deiconify(); root.wait_window(win); root.withdraw()
     return result
 
 # ---------- CLI & Main ----------
+IDLE_POLL_SEC = 5          # resume detection doesn't need finer than this
+OFF_HOURS_POLL_SEC = 60    # outside work_window only the window start matters
+
 def parse_args():
     ap = argparse.ArgumentParser(description="TOE popper (Tkinter)")
     ap.add_argument("--force", action="store_true", help="Prompt now for current slot if rules allow")
@@ -348,7 +550,7 @@ def compute_slot_for_time(cfg, fake_hhmm: Optional[str], exact_now: bool=False)
     start = t.replace(minute=minute, second=0, microsecond=0)
     return start, start + timedelta(minutes=mins)
 
-def _preview_log(slot_start: datetime, slot_end: datetime, subject: str, outlook_category: Optional[str], debug: bool):
+def _preview_log(slot_start: datetime, slot_end: datetime, subject: str, outlook_category: Optional[str]):
     start_local, start_utc = _local_and_utc(slot_start)
     end_local, end_utc = _local_and_utc(slot_end)
     print(
@@ -359,27 +561,63 @@ def _preview_log(slot_start: datetime, slot_end: datetime, subject: str, outlook
         f"      Start(UTC)  ={start_utc}  End(UTC)  ={end_utc}\n"
         f"      Outlook TZ binding=ignored (using StartUTC only)"
     )
-    if debug:
-        print("[TOE] (No appointment created due to --preview-only)")
+    log.debug("(No appointment created due to --preview-only)")
+
+def _scan_events(cfg: dict, slot_start: datetime, slot_end: datetime) -> List[dict]:
+    # runs on the Outlook thread; the focus items stay there in the scan cache
+    _, _, items = outlook_open_default_calendar()
+    return scan_slot_cached(items, cfg, slot_start, slot_end)[0]
+
+def _replace_slot(cfg: dict, slot_start: datetime, slot_end: datetime, subj: str,
+                  outlook_category: Optional[str], preview_only: bool):
+    # runs on the Outlook thread
+    app, calendar, items = outlook_open_default_calendar()
 
-def prompt_once(cfg: dict, app, calendar, items, slot_start: datetime, slot_end: datetime,
-                bypass: bool, state: dict, debug=False, preview_only: bool=False):
+    # If a Focus Sprint occurrence exists, delete that occurrence before creating the new appt.
+    focus_occurs = scan_slot_cached(items, cfg, slot_start, slot_end)[1]
+    forget_scan()
+    log.debug("focus occurrences to delete: %d", len(focus_occurs))
+    for occ in focus_occurs:
+        try:
+            occ.Delete()  # deletes only this occurrence
+            log.debug("deleted Focus Sprint occurrence")
+        except Exception as ex:
+            log.error("Failed to delete Focus Sprint occurrence: %s", ex)
+
+    if preview_only:
+        _preview_log(slot_start, slot_end, subj, outlook_category)
+    else:
+        try:
+            create_appointment(app, calendar, slot_start, slot_end, subj, outlook_category)
+            log.debug("appointment created")
+        except Exception as ex:
+            log.error("Failed to create Outlook appointment: %s", ex)
+
+def prompt_once(cfg: dict, slot_start: datetime, slot_end: datetime,
+                bypass: bool, state: dict, preview_only: bool=False):
     # Enforce work_window unless bypassing.
     if not bypass and not within_work_window(cfg, slot_start):
-        if debug: print("[TOE] outside work_window; not prompting")
+        log.debug("outside work_window; not prompting")
         return
 
     # Gate rules unless bypass.
-    if not bypass and not should_prompt(cfg, items, slot_start, slot_end, debug=debug):
-        if debug: print("[TOE] rules block prompt for this slot")
-        return
+    if not bypass:
+        try:
+            evs = _ol_submit(_scan_events, cfg, slot_start, slot_end)
+        except queue.Empty:
+            log.warning("Outlook did not answer in time; skipping this prompt")
+            return
+        if not should_prompt(cfg, evs, slot_start, slot_end):
+            log.debug("rules block prompt for this slot")
+            return
 
     # Show modal
     cats = cfg.get("categories", {})
     rem = {"last_category": state.get("last_category"), "last_timecode": state.get("last_timecode")}
     snooze_m = int(cfg.get("ui", {}).get("snooze_minutes", 10))
-    res = run_modal_tk(slot_start, slot_end, cats, rem, snooze_m)
-    if debug: print("[TOE] modal result:", res)
+    res = run_modal_tk(slot_start, slot_end, cats, rem, snooze_m,
+                       cfg.get("_cat_names_sorted"), cfg.get("_tc_by_cat"))
+    log.debug("modal result: %s", res)
 
     if res.get("action") == "save":
         text = (res.get("text") or "").strip()
@@ -388,25 +626,9 @@ def prompt_once(cfg: dict, app, calendar, items, slot_start: datetime, slot_end:
         if text and tcode:
             subj = f"{text}"
             outlook_category = cats.get(cat, {}).get("outlook_category")
-
-            # If a Focus Sprint occurrence exists, delete that occurrence before creating the new appt.
-            focus_occurs = find_focus_occurrences(items, slot_start, slot_end, cfg)
-            if debug: print(f"[TOE] focus occurrences to delete: {len(focus_occurs)}")
-            for occ in focus_occurs:
-                try:
-                    occ.Delete()  # deletes only this occurrence
-                    if debug: print("[TOE] deleted Focus Sprint occurrence")
-                except Exception as ex:
-                    print("Failed to delete Focus Sprint occurrence:", ex, file=sys.stderr)
-
-            if preview_only:
-                _preview_log(slot_start, slot_end, subj, outlook_category, debug)
-            else:
-                try:
-                    create_appointment(app, calendar, slot_start, slot_end, subj, outlook_category, debug=debug)
-                    if debug: print("[TOE] appointment created")
-                except Exception as ex:
-                    print("Failed to create Outlook appointment:", ex, file=sys.stderr)
+            # delete + create happen on the Outlook thread; nothing here waits for them
+            _ol_submit(_replace_slot, cfg, slot_start, slot_end, subj, outlook_category,
+                       preview_only, wait=False)
 
         if cfg.get("ui", {}).get("remember_last", True):
             state["last_category"] = cat
@@ -414,25 +636,36 @@ def prompt_once(cfg: dict, app, calendar, items, slot_start: datetime, slot_end:
             save_state(state)
 
     elif res.get("action") == "snooze":
+        # the scheduler loop re-prompts once this passes; nothing blocks meanwhile
         minutes = snooze_m
-        if debug: print(f"[TOE] snoozing for {minutes} minutes…")
-        time.sleep(minutes * 60)
+        log.debug("snoozing for %d minutes…", minutes)
+        state["snooze_until"] = (now_local() + timedelta(minutes=minutes)).isoformat(timespec="seconds")
+        save_state(state)
+
+def _snooze_until(state: dict) -> Optional[datetime]:
+    until = state.get("snooze_until")
+    if not until:
+        return None
+    try:
+        return datetime.fromisoformat(until)
+    except (TypeError, ValueError):
+        return None
 
 def main():
     args = parse_args()
-    cfg = load_config(args.config, debug=args.debug)
+    logging.basicConfig(format="[TOE] %(message)s")
+    log.setLevel(logging.DEBUG if args.debug else logging.WARNING)
+    cfg = load_config(args.config)
     state = load_state()
-    if args.debug: print("[TOE] categories =", list(cfg.get("categories", {}).keys()))
-
-    app, calendar, items = outlook_open_default_calendar()
+    log.debug("categories = %s", cfg["_cat_names_sorted"])
 
     # Manual one-shot
     if args.force or args.force_bypass:
         s, e = compute_slot_for_time(cfg, args.at, args.exact_now)
-        if args.debug:
-            print(f"[TOE] one-shot for slot {s:%H:%M}-{e:%H:%M} (bypass={args.force_bypass})")
-        prompt_once(cfg, app, calendar, items, s, e, bypass=args.force_bypass, state=state,
-                    debug=args.debug, preview_only=args.preview_only)
+        log.debug("one-shot for slot %s-%s (bypass=%s)", f"{s:%H:%M}", f"{e:%H:%M}", args.force_bypass)
+        prompt_once(cfg, s, e, bypass=args.force_bypass, state=state,
+                    preview_only=args.preview_only)
+        _ol_drain()
         return
 
     # Scheduler loop (already constrained to work_window)
@@ -447,16 +680,37 @@ def main():
     try:
         while True:
             now = now_local()
-            if within_work_window(cfg, now):
-                s, e = current_slot(slot_minutes)
+            refresh_local_tz()
+            s, e = current_slot(slot_minutes)
+            wake = e
+            snooze_until = _snooze_until(state)
+            if snooze_until is not None and now >= snooze_until:
+                state["snooze_until"] = None
+                save_state(state)
+                # re-prompt when a snooze runs out, unless it's left over from an earlier slot
+                if snooze_until >= s and within_work_window(cfg, now):
+                    last_slot_key_prompted = s.strftime("%Y-%m-%d %H:%M")
+                    # the cached scan predates the snooze; queued ahead of the re-prompt's scan
+                    _ol_submit(forget_scan, wait=False)
+                    log.debug("snooze over; prompting for slot %s", last_slot_key_prompted)
+                    prompt_once(cfg, s, e, bypass=False, state=state,
+                                preview_only=args.preview_only)
+                continue
+
+            if snooze_until is not None:
+                # boundaries passing during a snooze are absorbed by the re-prompt at its end
+                last_slot_key_prompted = s.strftime("%Y-%m-%d %H:%M")
+                wake = min(e, snooze_until)
+                poll = OFF_HOURS_POLL_SEC
+            elif within_work_window(cfg, now):
                 slot_key = s.strftime("%Y-%m-%d %H:%M")
 
                 # Boundary trigger (first 5 seconds of the slot)
                 if slot_key != last_slot_key_prompted and now.second < 5:
                     last_slot_key_prompted = slot_key
-                    if args.debug: print(f"[TOE] boundary prompt for slot {slot_key}")
-                    prompt_once(cfg, app, calendar, items, s, e, bypass=False, state=state,
-                                debug=args.debug, preview_only=args.preview_only)
+                    log.debug("boundary prompt for slot %s", slot_key)
+                    prompt_once(cfg, s, e, bypass=False, state=state,
+                                preview_only=args.preview_only)
 
                 # Re-nag if user just came back within same slot and conditions allow
                 idle = get_idle_seconds()
@@ -467,13 +721,21 @@ def main():
                         was_idle = False
                         if slot_key != last_slot_key_prompted:
                             last_slot_key_prompted = slot_key
-                            if args.debug: print(f"[TOE] resume prompt for slot {slot_key}")
-                            prompt_once(cfg, app, calendar, items, s, e, bypass=False, state=state,
-                                        debug=args.debug, preview_only=args.preview_only)
+                            log.debug("resume prompt for slot %s", slot_key)
+                            prompt_once(cfg, s, e, bypass=False, state=state,
+                                        preview_only=args.preview_only)
+                poll = IDLE_POLL_SEC
+            else:
+                poll = OFF_HOURS_POLL_SEC
 
-            time.sleep(1.0)
+            # Sleep until the next slot boundary (or snooze end), waking early only for idle checks.
+            # The prompt may have been open for a while, so measure from a fresh clock.
+            time.sleep(max(0.05, min(poll, (wake - now_local()).total_seconds())))
     except KeyboardInterrupt:
         print("Exiting…")
+    finally:
+        _close_tk()
+        _ol_drain(timeout=OUTLOOK_TIMEOUT_SEC)
 
 if __name__ == "__main__":
     main()